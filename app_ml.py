@@ -1,13 +1,8 @@
 # app_ml.py
 import streamlit as st
 
-# Try to import your classical ΔG function; if named differently, update the import.
-try:
-    from thermo import compute_delta_g  # <-- change to your actual module/function
-except Exception:
-    compute_delta_g = None
-
-from ml.infer import predict_delta_g, predict_spontaneous
+from main import compute_delta_g
+from ml.infer import predict_both
 
 st.title("Thermochemistry Explorer — AI/ML Enhanced")
 
@@ -15,21 +10,27 @@ reaction = st.text_input("Enter reaction (e.g., 2H2 + O2 -> 2H2O)", "2H2 + O2 ->
 reg_model = "models/delta_g_rf.pkl"
 cls_model = "models/spont_rf.pkl"
 
+# cache_data memoizes per reaction string across Streamlit reruns, so
+# repeat Analyze clicks on the same input skip the NIST fetches and the
+# ML featurization entirely.
+@st.cache_data
+def _classical(r: str) -> float:
+    return compute_delta_g(r)  # kJ/mol
+
+@st.cache_data
+def _ml(r: str) -> tuple[float, bool]:
+    dg_pred, spont_pred = predict_both(reg_model, cls_model, [r])
+    return float(dg_pred[0]), bool(spont_pred[0])
+
 if st.button("Analyze"):
-    if compute_delta_g:
-        try:
-            classical = compute_delta_g(reaction)  # kJ/mol
-            st.metric("Classical ΔG (kJ/mol)", f"{classical:.2f}")
-        except Exception as e:
-            st.warning(f"Classical calc unavailable: {e}")
-    else:
-        st.info("Classical ΔG function not found; showing ML only.")
+    try:
+        st.metric("Classical ΔG (kJ/mol)", f"{_classical(reaction):.2f}")
+    except Exception as e:
+        st.warning(f"Classical calc unavailable: {e}")
 
     try:
-        ml_pred = predict_delta_g(reg_model, reaction)
-        is_spont = predict_spontaneous(cls_model, reaction)
+        ml_pred, is_spont = _ml(reaction)
         st.metric("ML Predicted ΔG (kJ/mol)", f"{ml_pred:.2f}")
         st.metric("Spontaneous? (ML)", "Yes ✅" if is_spont else "No ❌")
     except Exception as e:
         st.error(f"ML prediction failed: {e}")
-
@@ -6,9 +6,11 @@ Columbia University, Department of Computer Science
 Visualizes the thermodynamic profile of chemical reactions by plotting relative enthalpy levels.
 Illustrates exothermic or endothermic character based on ΔH calculations.
 """
-import matplotlib.pyplot as plt
-
 def plot_energy_diagram(delta_h):
+    # Imported lazily: pyplot costs hundreds of ms at import time, and most
+    # entry points (training scripts, Streamlit app) never plot.
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(6, 4))
     
     reactant_energy = 0
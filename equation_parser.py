@@ -12,22 +12,53 @@ def parse_equation(equation):
     products = _parse_side(right)
     return reactants, products
 
+def _iter_terms(side):
+    """Yield (coeff, formula) for each term in one side of an equation.
+
+    Walks the string once with a manual index instead of layering
+    split('+') / strip() / split(' ') passes, so no intermediate substring
+    lists are built. Handles '2 H2O', '2H2O', '2.5 O2', and '7/2 O2'.
+    """
+    i, n = 0, len(side)
+    while i < n:
+        if side[i].isspace() or side[i] == "+":
+            i += 1
+            continue
+        start = i
+        while i < n and (side[i].isdigit() or side[i] in "./"):
+            i += 1
+        coeff_str = side[start:i]
+        while i < n and side[i].isspace():
+            i += 1
+        start = i
+        while i < n and side[i] != "+" and not side[i].isspace():
+            i += 1
+        formula = side[start:i]
+        if not formula:
+            # A bare numeric token with no formula after it: treat the
+            # digits as the formula, as the old splitter did.
+            coeff_str, formula = "", coeff_str
+        yield parse_coefficient(coeff_str), formula
+
+def parse_coefficient(coeff_str):
+    """Parse a stoichiometric coefficient: '', '2', '2.5', '7/2', '(7/2)'.
+
+    Shared by the equation parser and the ML featurizer so both agree on
+    coefficient semantics. Malformed input falls back to 1.0."""
+    coeff_str = coeff_str.strip("()")
+    if not coeff_str:
+        return 1.0
+    try:
+        if "/" in coeff_str:
+            num, den = coeff_str.split("/", 1)
+            return float(num) / float(den)
+        return float(coeff_str)
+    except (ValueError, ZeroDivisionError):
+        return 1.0
+
 def _parse_side(side):
-    parts = side.split("+")
     species = {}
-    for part in parts:
-        part = part.strip()
-        tokens = part.split(" ")
-        if len(tokens) == 1:
-            coeff = 1
-            formula = tokens[0]
-        else:
-            try:
-                coeff = float(tokens[0])
-                formula = tokens[1]
-            except ValueError:
-                coeff = 1
-                formula = part
-        species[formula] = coeff
+    for coeff, formula in _iter_terms(side):
+        species[formula] = species.get(formula, 0.0) + coeff
     return species
 
@@ -25,6 +25,8 @@ FALLBACK_THERMO_DATA = {
     "H2O2": {"deltaH": -136.1, "deltaS": 109.6},
 }
 
+import numpy as np
+
 from nist_scraper import fetch_nist_data
 from equation_parser import parse_equation
 from energy_diagram import plot_energy_diagram
@@ -40,26 +42,74 @@ def delta_S(reactants, products, data):
 def delta_G(dh, ds, T):
     return dh - (T * ds / 1000)
 
-def main():
-    print("Thermochemistry Explorer (NIST with fallback)")
-    equation = input("Enter a balanced chemical equation (e.g., CH4 + 2 O2 -> CO2 + 2 H2O): ")
-    T = float(input("Enter temperature in Kelvin: "))
+def compute_deltas_batch(reactions, data, T=298.15):
+    """Compute ΔH, ΔS, ΔG for many reactions with two matrix products.
 
-    reactants, products = parse_equation(equation)
-    all_species = list(set(reactants.keys()).union(products.keys()))
+    Stacks the signed stoichiometric coefficients into an (N reactions x
+    S species) matrix and dots it against the ΔHf°/S° vectors, replacing
+    the per-reaction dict loops with BLAS-level arithmetic.
+
+    Args:
+        reactions: iterable of balanced equation strings
+        data: {species: {'deltaH': kJ/mol, 'deltaS': J/mol·K}}
+        T: temperature in Kelvin
 
+    Returns:
+        (dH, dS, dG) NumPy arrays, one entry per reaction.
+    """
+    species_idx = {sp: i for i, sp in enumerate(data)}
+    H = np.array([data[sp]["deltaH"] for sp in species_idx])
+    S = np.array([data[sp]["deltaS"] for sp in species_idx])
+
+    C = np.zeros((len(reactions), len(species_idx)))
+    for r, reaction in enumerate(reactions):
+        reactants, products = parse_equation(reaction)
+        for sp, coeff in products.items():
+            C[r, species_idx[sp]] += coeff
+        for sp, coeff in reactants.items():
+            C[r, species_idx[sp]] -= coeff
+
+    dH = C @ H
+    dS = C @ S
+    return dH, dS, delta_G(dH, dS, T)
+
+def fetch_thermo_data(species_list):
+    """Resolve thermo data for each species via NIST, then the fallback table.
+
+    Returns ({species: data}, [species with no data anywhere])."""
     thermo_data = {}
-    for species in all_species:
+    for species in species_list:
         data = fetch_nist_data(species)
         if data:
             thermo_data[species] = data
         elif species in FALLBACK_THERMO_DATA:
             print(f"Using fallback data for {species}")
             thermo_data[species] = FALLBACK_THERMO_DATA[species]
-        else:
-            print(f"Missing thermo data for {species}, skipping.")
-    
-    missing = [sp for sp in all_species if sp not in thermo_data]
+    missing = [sp for sp in species_list if sp not in thermo_data]
+    return thermo_data, missing
+
+def compute_delta_g(equation, T=298.15):
+    """Classical ΔG (kJ/mol) for a balanced equation string at temperature T.
+
+    Raises ValueError when thermo data cannot be resolved for a species."""
+    reactants, products = parse_equation(equation)
+    all_species = list(reactants.keys() | products.keys())
+    thermo_data, missing = fetch_thermo_data(all_species)
+    if missing:
+        raise ValueError(f"Missing thermo data for: {missing}")
+    dh = delta_H(reactants, products, thermo_data)
+    ds = delta_S(reactants, products, thermo_data)
+    return delta_G(dh, ds, T)
+
+def main():
+    print("Thermochemistry Explorer (NIST with fallback)")
+    equation = input("Enter a balanced chemical equation (e.g., CH4 + 2 O2 -> CO2 + 2 H2O): ")
+    T = float(input("Enter temperature in Kelvin: "))
+
+    reactants, products = parse_equation(equation)
+    all_species = list(reactants.keys() | products.keys())
+
+    thermo_data, missing = fetch_thermo_data(all_species)
     if missing:
         print("️ Could not retrieve data for:", missing)
         return
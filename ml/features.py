@@ -3,48 +3,75 @@ from typing import Dict, List, Tuple
 import numpy as np, re
 from collections import Counter
 
-_ELEMENT_RE = re.compile(r"([A-Z][a-z]?)(\d*)")
-_COEF_RE = re.compile(r"^\s*(\(?[0-9./]+\)?)\s*(.*)$")
-
-def _parse_coef_and_formula(part: str) -> tuple[float, str]:
-    part = part.strip()
-    m = _COEF_RE.match(part)
-    if m:
-        raw = m.group(1).strip()
-        try:
-            coef = float(eval(raw))  # supports 7/2 style
-        except Exception:
-            try:
-                coef = float(raw)
-            except Exception:
-                coef = 1.0
-        formula = m.group(2).strip()
-    else:
-        coef, formula = 1.0, part
-    return coef, formula
-
-def _element_counts(formula: str) -> Dict[str, float]:
-    counts: Dict[str, float] = {}
-    for elem, num in _ELEMENT_RE.findall(formula):
-        n = float(num) if num else 1.0
-        counts[elem] = counts.get(elem, 0.0) + n
-    return counts
-
-def _expand_side(side: str) -> Counter:
-    total = Counter()
-    for part in side.split("+"):
-        if not part.strip(): 
-            continue
-        coef, formula = _parse_coef_and_formula(part)
-        ec = _element_counts(formula)
-        for k, v in ec.items():
-            total[k] += coef * v
-    return total
+# Coefficient semantics are shared with the classical equation parser so
+# both code paths agree on '7/2'-style stoichiometry.
+from equation_parser import parse_coefficient as _parse_coef
+
+try:  # optional: JIT the batch accumulation kernel when numba is available
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _scatter_fill(rows, cols, vals, out):
+    for i in range(rows.shape[0]):
+        out[rows[i], cols[i]] = vals[i]
+
+if njit is not None:
+    _scatter_fill = njit(cache=True)(_scatter_fill)
+
+# One alternation pattern tokenizes a whole reaction string in a single
+# finditer pass: separators, term coefficients, and element+subscript runs.
+_TOKEN_RE = re.compile(
+    r"(?P<arrow>->)"
+    r"|(?P<plus>\+)"
+    r"|(?P<coef>\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?)"
+    r"|(?P<elem>[A-Z][a-z]?)(?P<n>\d*)"
+)
+
+def _atoi(s: str) -> int:
+    """Fold a short ASCII digit run into an int; empty means an implicit 1.
+
+    Subscripts are 0-3 characters, so this tight loop beats the general
+    float()/int() constructors that dominate per-element conversion cost."""
+    n = 0
+    for c in s:
+        n = n * 10 + (ord(c) - 48)
+    return n or 1
+
+def _scan_reaction(reaction: str) -> tuple[Counter, Counter, int, int]:
+    """Tokenize a whole reaction in one _TOKEN_RE pass.
+
+    Maintains which side we are on (flipped by the arrow token), the
+    pending term coefficient (reset by separators), and per-side term
+    counts, accumulating element totals directly — no per-term split or
+    per-formula findall."""
+    L, R = Counter(), Counter()
+    side, side_i = L, 0
+    n_terms = [0, 0]
+    coef = 1.0
+    term_open = False
+    for m in _TOKEN_RE.finditer(reaction):
+        if m.group("arrow"):
+            side, side_i = R, 1
+            coef, term_open = 1.0, False
+        elif m.group("plus"):
+            coef, term_open = 1.0, False
+        elif m.group("coef"):
+            if not term_open:
+                n_terms[side_i] += 1
+                term_open = True
+            coef = _parse_coef(m.group("coef"))
+        else:
+            if not term_open:
+                n_terms[side_i] += 1
+                term_open = True
+            side[m.group("elem")] += coef * _atoi(m.group("n"))
+    return L, R, n_terms[0], n_terms[1]
 
 def featurize_reaction(reaction: str) -> Dict[str, float]:
     lhs, rhs = [s.strip() for s in reaction.split("->")]
-    L, R = _expand_side(lhs), _expand_side(rhs)
-    elems = sorted(set(L) | set(R))
+    L, R, n_reactants, n_products = _scan_reaction(reaction)
+    elems = sorted(L.keys() | R.keys())
 
     feats: Dict[str, float] = {}
     # Per-side totals
@@ -55,8 +82,8 @@ def featurize_reaction(reaction: str) -> Dict[str, float]:
 
     # Simple string/shape features
     feats["num_elems"] = float(len(elems))
-    feats["n_reactants"] = float(len([p for p in lhs.split("+") if p.strip()]))
-    feats["n_products"]  = float(len([p for p in rhs.split("+") if p.strip()]))
+    feats["n_reactants"] = float(n_reactants)
+    feats["n_products"]  = float(n_products)
     feats["len_lhs"] = float(len(lhs)); feats["len_rhs"] = float(len(rhs))
     feats["contains_O"] = 1.0 if "O" in elems else 0.0
     feats["contains_N"] = 1.0 if "N" in elems else 0.0
@@ -64,9 +91,86 @@ def featurize_reaction(reaction: str) -> Dict[str, float]:
     feats["contains_H"] = 1.0 if "H" in elems else 0.0
     return feats
 
+# Scalar feature names; order must match the row layout in vectorize_batch.
+_SCALAR_KEYS = (
+    "num_elems", "n_reactants", "n_products", "len_lhs", "len_rhs",
+    "contains_O", "contains_N", "contains_C", "contains_H",
+)
+
+def vectorize_batch(reactions: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Vectorize many reactions without per-reaction feature dicts.
+
+    Produces the same (X, keys) as mapping featurize_reaction over the
+    list, but flattens all element features into parallel row/col/value
+    arrays and accumulates them with one np.add.at call; scalar features
+    are written column-wise. Intended for the training path where N is
+    large."""
+    scans = []
+    vocab: set[str] = set()
+    for r in reactions:
+        L, R, n_react, n_prod = _scan_reaction(r)
+        lhs, rhs = [s.strip() for s in r.split("->")]
+        scans.append((L, R, n_react, n_prod, len(lhs), len(rhs)))
+        vocab.update(L)
+        vocab.update(R)
+
+    keys = sorted({f"{p}{e}" for e in vocab for p in ("L_", "R_", "d_")}
+                  | set(_SCALAR_KEYS))
+    col = {k: i for i, k in enumerate(keys)}
+    X = np.zeros((len(reactions), len(keys)), dtype=np.float32)
+
+    rows: List[int] = []
+    cols: List[int] = []
+    vals: List[float] = []
+    scalars = np.empty((len(reactions), len(_SCALAR_KEYS)), dtype=np.float32)
+    for i, (L, R, n_react, n_prod, len_lhs, len_rhs) in enumerate(scans):
+        elems = L.keys() | R.keys()
+        for e in elems:
+            lv, rv = L.get(e, 0.0), R.get(e, 0.0)
+            rows += (i, i, i)
+            cols += (col[f"L_{e}"], col[f"R_{e}"], col[f"d_{e}"])
+            vals += (lv, rv, rv - lv)
+        scalars[i] = (
+            len(elems), n_react, n_prod, len_lhs, len_rhs,
+            1.0 if "O" in elems else 0.0, 1.0 if "N" in elems else 0.0,
+            1.0 if "C" in elems else 0.0, 1.0 if "H" in elems else 0.0,
+        )
+
+    np.add.at(
+        X,
+        (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)),
+        np.asarray(vals, dtype=np.float32),
+    )
+    for j, k in enumerate(_SCALAR_KEYS):
+        X[:, col[k]] = scalars[:, j]
+    return X, keys
+
 def vectorize(reactions: List[str]) -> Tuple[np.ndarray, List[str]]:
     dicts = [featurize_reaction(r) for r in reactions]
-    keys = sorted(set().union(*[d.keys() for d in dicts]))
-    X = np.array([[d.get(k, 0.0) for k in keys] for d in dicts], dtype=float)
+    key_set: set = set()
+    for d in dicts:
+        key_set.update(d)
+    keys = sorted(key_set)
+    # Write the (sparse-ish) feature dicts into a preallocated matrix rather
+    # than building an N x K nested list: only non-zero entries cost a lookup.
+    col = {k: i for i, k in enumerate(keys)}
+    # Phase 1 (pure Python): flatten the dicts into parallel index/value
+    # arrays. Phase 2: a single numeric scatter loop, JIT-compiled by numba
+    # when installed, plain Python otherwise.
+    rows, cols, vals = [], [], []
+    for i, d in enumerate(dicts):
+        for k, v in d.items():
+            rows.append(i)
+            cols.append(col[k])
+            vals.append(v)
+    # float32: features are small counts, and sklearn's tree fitting casts
+    # to float32 internally anyway — emitting it here halves X's footprint.
+    X = np.zeros((len(dicts), len(keys)), dtype=np.float32)
+    _scatter_fill(
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(cols, dtype=np.int64),
+        np.asarray(vals, dtype=float),
+        X,
+    )
     return X, keys
 
@@ -1,14 +1,33 @@
 # ml/infer.py
+from functools import lru_cache
+
 from .features import vectorize
 from .models import load_model
 
-def predict_delta_g(model_path: str, reaction: str) -> float:
-    model = load_model(model_path)
+@lru_cache(maxsize=256)
+def _vectorize_one(reaction: str):
     X, _ = vectorize([reaction])
-    return float(model.predict(X)[0])
+    return X
+
+def predict_vec(model, X):
+    """Predict on an already-vectorized feature matrix.
+
+    For callers that featurized upfront (batch pipelines, API servers):
+    no per-call parsing, dict building, or row allocation."""
+    return model.predict(X)
+
+def predict_delta_g(model_path: str, reaction: str) -> float:
+    return float(predict_vec(load_model(model_path), _vectorize_one(reaction))[0])
 
 def predict_spontaneous(model_path: str, reaction: str) -> bool:
-    model = load_model(model_path)
-    X, _ = vectorize([reaction])
-    return bool(model.predict(X)[0])
+    return bool(predict_vec(load_model(model_path), _vectorize_one(reaction))[0])
+
+def predict_both(reg_path: str, cls_path: str, reactions: list[str]):
+    """Vectorize once, run both models on the shared X.
+
+    Returns (delta_g_array, spontaneous_bool_array)."""
+    X, _ = vectorize(reactions)
+    reg = load_model(reg_path)
+    cls = load_model(cls_path)
+    return predict_vec(reg, X), predict_vec(cls, X).astype(bool)
 
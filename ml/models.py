@@ -1,20 +1,79 @@
 # ml/models.py
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+import os
+from functools import lru_cache
+from sklearn.ensemble import (
+    HistGradientBoostingClassifier,
+    HistGradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
 import joblib
 from pathlib import Path
 from typing import Any
 
-def make_regressor() -> RandomForestRegressor:
-    return RandomForestRegressor(n_estimators=300, random_state=42)
+def make_regressor(max_depth: int | None = None) -> RandomForestRegressor:
+    # Trees are independent, so n_jobs=-1 grows them across all cores;
+    # max_samples=0.8 subsamples rows per tree, cutting fit time with
+    # negligible accuracy cost on our datasets.
+    return RandomForestRegressor(
+        n_estimators=300,
+        max_depth=max_depth,
+        max_samples=0.8,
+        n_jobs=-1,
+        random_state=42,
+    )
 
-def make_classifier() -> RandomForestClassifier:
-    return RandomForestClassifier(n_estimators=300, class_weight="balanced", random_state=42)
+def make_classifier(max_depth: int | None = None) -> RandomForestClassifier:
+    return RandomForestClassifier(
+        n_estimators=300,
+        max_depth=max_depth,
+        max_samples=0.8,
+        class_weight="balanced",
+        n_jobs=-1,
+        random_state=42,
+    )
+
+def make_hist_regressor() -> HistGradientBoostingRegressor:
+    # Histogram gradient boosting bins features into uint8 histograms, so
+    # fit and predict are typically an order of magnitude faster than the
+    # RF baseline on our count-style features, at comparable accuracy.
+    return HistGradientBoostingRegressor(
+        max_iter=300, max_bins=255, early_stopping=True, random_state=42
+    )
+
+def make_hist_classifier() -> HistGradientBoostingClassifier:
+    return HistGradientBoostingClassifier(
+        max_iter=300, max_bins=255, early_stopping=True, random_state=42
+    )
+
+try:  # lz4 decompresses much faster than zlib; fall back if not installed
+    import lz4  # noqa: F401  (joblib looks it up by name)
+    _COMPRESS: Any = ("lz4", 3)
+except ImportError:
+    _COMPRESS = 3  # zlib
 
 def save_model(model: Any, path: str | Path) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump(model, path)
+    joblib.dump(model, path, compress=_COMPRESS)
+
+# Leading bytes of the compressed containers joblib can produce (zlib,
+# gzip, bz2, xz, lz4). A plain joblib pickle starts with the pickle
+# protocol opcode instead.
+_COMPRESSED_MAGIC = (b"\x78", b"\x1f\x8b", b"BZh", b"\xfd7zXZ", b"\x04\x22\x4d\x18")
+
+@lru_cache(maxsize=8)
+def _cached_load(path_str: str, mtime: float) -> Any:
+    # mtime is only part of the cache key: a retrained model at the same
+    # path gets a fresh unpickle instead of the stale cached one.
+    # mmap only applies to uncompressed artifacts (e.g. models saved before
+    # compression was enabled) — joblib warns on every load if the flag is
+    # passed for a compressed file, so sniff the magic bytes first.
+    with open(path_str, "rb") as fh:
+        compressed = fh.read(8).startswith(_COMPRESSED_MAGIC)
+    return joblib.load(path_str, mmap_mode=None if compressed else "r")
 
 def load_model(path: str | Path) -> Any:
-    return joblib.load(path)
+    path = Path(path)
+    return _cached_load(str(path), os.path.getmtime(path))
 
@@ -9,6 +9,17 @@ Used as a live data source to support accurate, real-time analysis of chemical s
 import requests
 from bs4 import BeautifulSoup
 
+# One session for the search + thermo page pair keeps the TCP/TLS
+# connection to NIST warm across requests.
+_session = requests.Session()
+
+# Normalized property-name fragments -> keys in the returned data dict.
+_PROPERTY_KEYS = {
+    'Standard Enthalpy of Formation': 'deltaH',
+    'Standard Entropy': 'deltaS',
+    'Standard Gibbs Energy of Formation': 'deltaG',
+}
+
 def fetch_nist_data(formula):
     """
     Fetch thermochemical data (ΔH, ΔS, ΔG) from NIST Chemistry WebBook for a given chemical formula.
@@ -30,62 +41,51 @@ def fetch_nist_data(formula):
 
     try:
         # Step 1: Search for the compound
-        search_resp = requests.get(base_url, params=params)
+        search_resp = _session.get(base_url, params=params)
         search_resp.raise_for_status()
-        search_soup = BeautifulSoup(search_resp.text, 'html.parser')
+        # lxml backend: C parser, ~5-10x faster than html.parser on these pages
+        search_soup = BeautifulSoup(search_resp.text, 'lxml')
 
         # Step 2: Find the link to thermochemical data page
         # Usually it's the first link under 'Thermochemical Data' section
-        thermo_link = None
-        for a_tag in search_soup.find_all('a', href=True):
-            href = a_tag['href']
-            if 'thermo' in href.lower():
-                thermo_link = href
-                break
-
-        if not thermo_link:
+        thermo_tag = search_soup.select_one('a[href*="thermo" i]')
+        if thermo_tag is None:
             print(f"No thermochemical data found for {formula}")
             return None
+        thermo_link = thermo_tag['href']
 
         # Construct full URL for thermo page
         thermo_url = f"https://webbook.nist.gov{thermo_link}"
 
         # Step 3: Request the thermochemical data page
-        thermo_resp = requests.get(thermo_url)
+        thermo_resp = _session.get(thermo_url)
         thermo_resp.raise_for_status()
-        thermo_soup = BeautifulSoup(thermo_resp.text, 'html.parser')
+        thermo_soup = BeautifulSoup(thermo_resp.text, 'lxml')
 
         # Step 4: Parse ΔH, ΔS, and ΔG from the thermo table
         data = {'deltaH': None, 'deltaS': None, 'deltaG': None}
 
-        # Look for table rows with relevant properties
-        for tr in thermo_soup.find_all('tr'):
+        # Look for table rows with relevant properties; stop as soon as all
+        # three fields are filled rather than walking the rest of the page.
+        for tr in thermo_soup.select('table tr'):
             tds = tr.find_all('td')
             if len(tds) < 2:
                 continue
             prop_name = tds[0].get_text(strip=True)
             value_text = tds[1].get_text(strip=True)
 
-            if 'Standard Enthalpy of Formation' in prop_name:
-                # Extract numeric value and convert kcal/mol to kJ/mol if necessary
-                try:
-                    val = float(value_text.split()[0])
-                    # NIST reports in kJ/mol, so no conversion needed
-                    data['deltaH'] = val
-                except:
-                    pass
-            elif 'Standard Entropy' in prop_name:
-                try:
-                    val = float(value_text.split()[0])
-                    data['deltaS'] = val
-                except:
-                    pass
-            elif 'Standard Gibbs Energy of Formation' in prop_name:
-                try:
-                    val = float(value_text.split()[0])
-                    data['deltaG'] = val
-                except:
-                    pass
+            for fragment, key in _PROPERTY_KEYS.items():
+                if fragment in prop_name and data[key] is None:
+                    # NIST reports in kJ/mol (SI units requested), so no
+                    # conversion needed
+                    try:
+                        data[key] = float(value_text.split()[0])
+                    except (ValueError, IndexError):
+                        pass
+                    break
+
+            if all(v is not None for v in data.values()):
+                break
 
         if all(v is None for v in data.values()):
             print(f"Thermochemical data incomplete or missing for {formula}")
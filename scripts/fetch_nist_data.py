@@ -30,39 +30,71 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import math
 import re
+import threading
 import time
+from html import unescape
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from types import MappingProxyType
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Dict, Mapping, Tuple, List
 
+import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+try:  # optional: lexbor is a lean C HTML5 parser, much faster than BS4 trees
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:  # optional: orjson (de)serializes the cache 5-20x faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE = "https://webbook.nist.gov/cgi/cbook.cgi"
 T_REF = 298.15  # K
 
+# Shared session: keep-alive removes the TCP/TLS handshake per request, and
+# the widened pool lets the prefetch threads hold concurrent connections.
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 # ----------------------------
 # Parsing chemistry strings
 # ----------------------------
 
 COEF_RE = re.compile(r"^\s*(\(?[0-9./]+\)?)\s*(.*)$")
 ELEMENT_RE = re.compile(r"([A-Z][a-z]?)(\d*)")
+STATE_RE = re.compile(r"\((g|l|s|aq)\)$")
+
+@lru_cache(maxsize=128)
+def parse_coef(raw: str) -> float:
+    """Parse '2', '2.5', or '7/2' (optionally parenthesized) without eval().
 
+    Fraction handles both integer ratios and decimal strings in C, and the
+    lru_cache pays off because the same few coefficients repeat across
+    reactions."""
+    try:
+        return float(Fraction(raw.strip("()")))
+    except (ValueError, ZeroDivisionError):
+        return 1.0
+
+@lru_cache(maxsize=1024)
 def parse_coef_and_formula(part: str) -> tuple[float, str]:
     part = part.strip()
     m = COEF_RE.match(part)
     if m:
-        raw = m.group(1).strip()
-        try:
-            coef = float(eval(raw))  # supports 7/2
-        except Exception:
-            try:
-                coef = float(raw)
-            except Exception:
-                coef = 1.0
+        coef = parse_coef(m.group(1).strip())
         formula = m.group(2).strip()
     else:
         coef, formula = 1.0, part
@@ -71,88 +103,230 @@ def parse_coef_and_formula(part: str) -> tuple[float, str]:
     if formula.startswith("(") and formula.endswith(")"):
         formula = formula[1:-1].strip()
     # remove state symbols if present (e.g., H2O(g))
-    formula = re.sub(r"\((g|l|s|aq)\)$", "", formula).strip()
+    formula = STATE_RE.sub("", formula).strip()
     return coef, formula
 
-def parse_side(side: str) -> Dict[str, float]:
+@lru_cache(maxsize=None)
+def parse_side(side: str) -> Mapping[str, float]:
     total: Dict[str, float] = {}
     for part in side.split("+"):
         if not part.strip():
             continue
         coef, formula = parse_coef_and_formula(part)
         total[formula] = total.get(formula, 0.0) + coef
-    return total
+    # Read-only view: cached results are shared across callers, so none of
+    # them may mutate the underlying dict.
+    return MappingProxyType(total)
 
-def parse_reaction(reaction: str) -> tuple[Dict[str, float], Dict[str, float]]:
+@lru_cache(maxsize=None)
+def parse_reaction(reaction: str) -> tuple[Mapping[str, float], Mapping[str, float]]:
     if "->" not in reaction:
         raise ValueError(f"Reaction missing '->': {reaction}")
     lhs, rhs = [s.strip() for s in reaction.split("->", 1)]
     return parse_side(lhs), parse_side(rhs)
 
+def collect_species(reactions: List[str]) -> set:
+    """Every unique species across the reactions; malformed ones are warned and skipped."""
+    species: set = set()
+    for rxn in reactions:
+        try:
+            lhs, rhs = parse_reaction(rxn)
+        except ValueError as e:
+            print(f"[warn] {e}")
+            continue
+        species |= lhs.keys() | rhs.keys()
+    return species
+
 # ----------------------------
 # NIST fetch + HTML parse
 # ----------------------------
 
+# Raw-HTML cache: parser iterations re-read pages from disk instead of the
+# network. Configured in main(); None disables it (e.g. library use).
+HTML_CACHE_DIR: Path | None = None
+OFFLINE = False
+
+class OfflineMiss(RuntimeError):
+    """Raised when --offline is set and a page is not in the HTML cache."""
+
+# Politeness gate: enforce a minimum interval between real HTTP requests,
+# shared across the prefetch threads. Cache hits never wait.
+MIN_REQUEST_INTERVAL = 0.8  # seconds; overridden by --sleep
+_rate_lock = threading.Lock()
+_last_request = 0.0
+
+def _polite_wait() -> None:
+    global _last_request
+    with _rate_lock:
+        wait = MIN_REQUEST_INTERVAL - (time.monotonic() - _last_request)
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+
+def _cached_get(url: str, params: dict | None = None) -> str:
+    """GET a page, with optional on-disk HTML caching keyed on the full URL."""
+    cache_file = None
+    if HTML_CACHE_DIR is not None:
+        key = url if params is None else f"{url}?{urlencode(sorted(params.items()))}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        cache_file = HTML_CACHE_DIR / f"{digest}.html"
+        if cache_file.exists():
+            return cache_file.read_text()
+    if OFFLINE:
+        raise OfflineMiss(f"--offline: no cached HTML for {url}")
+    _polite_wait()
+    r = SESSION.get(url, params=params, timeout=20)
+    r.raise_for_status()
+    if cache_file is not None:
+        HTML_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(r.text)
+    return r.text
+
 def fetch_species_page(formula: str) -> str:
     """Fetch NIST WebBook page HTML for a chemical formula (SI units).
     Note: multiple isomers may exist; we fetch the Formula landing page."""
-    params = {"Formula": formula, "Units": "SI"}
-    r = requests.get(BASE, params=params, timeout=20)
-    r.raise_for_status()
-    return r.text
+    return _cached_get(BASE, params={"Formula": formula, "Units": "SI"})
+
+# First species-detail link on a landing page, matched on the raw HTML so the
+# common case never builds a DOM at all.
+SPECIES_URL_RE = re.compile(r'href="(/cgi/cbook\.cgi\?(?:ID|Name)=[^"]+)"')
+
+def _build_species_url(href: str) -> str:
+    if "Units=SI" not in href:
+        href += "&Units=SI"
+    if href.startswith("/"):
+        return "https://webbook.nist.gov" + href
+    return href
 
 def find_first_species_url(html: str) -> str | None:
     """On a Formula landing page, find the first species detail link."""
-    soup = BeautifulSoup(html, "html.parser")
     # Look for links like cbook.cgi?ID=... or cbook.cgi?Name=...
+    m = SPECIES_URL_RE.search(html)
+    if m:
+        return _build_species_url(unescape(m.group(1)))
+
+    # Fallback for a template change the regex misses (rare).
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        node = tree.css_first(
+            "a[href^='/cgi/cbook.cgi?ID='], a[href^='/cgi/cbook.cgi?Name=']"
+        )
+        if node is None:
+            return None
+        return _build_species_url(node.attributes["href"])
+
+    # Fallback: lxml backend + strainer, only anchor tags are materialized.
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("a", href=True))
     for a in soup.find_all("a", href=True):
         href = a["href"]
         if href.startswith("/cgi/cbook.cgi?ID=") or href.startswith("/cgi/cbook.cgi?Name="):
-            # Prefer Thermochemistry data pages
-            if "Units=SI" not in href:
-                href += "&Units=SI"
-            # Build absolute URL
-            if href.startswith("/"):
-                return "https://webbook.nist.gov" + href
-            return href
+            return _build_species_url(href)
     return None
 
 def fetch_species_detail(url: str) -> str:
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    return r.text
+    return _cached_get(url)
+
+def _textnorm(s: str) -> str:
+    return " ".join(s.split()).replace("\xa0", " ")
+
+# Fast-path extraction: the property labels appear as literal text near their
+# values, so after flattening tags we can regex the raw page and skip DOM
+# construction entirely. The DOM walk below stays as the fallback.
+TAG_RE = re.compile(r"<[^>]+>")
+HF_RE = re.compile(
+    r"Standard enthalpy of formation.{0,200}?([-+]?\d+(?:\.\d+)?)\s*kJ/mol", re.S
+)
+S_RE = re.compile(
+    r"Standard molar entropy.{0,200}?([-+]?\d+(?:\.\d+)?)\s*(k?)J/(?:mol·K|mol K|molK)",
+    re.S,
+)
+
+# Compiled once: XPath string(.) concatenates an element's text in C,
+# without the Python-level generator and join that itertext() needs.
+_ROW_TEXT = etree.XPath("string(.)")
+
+def _iter_row_texts(html: str, must_contain: str | None = None):
+    """Yield normalized text for each table row of a species page.
+
+    When must_contain is given, rows lacking that substring are skipped
+    with a raw containment check before any text assembly — most rows on
+    a species page fail the filter, so they never pay for extraction or
+    normalization."""
+    if LexborHTMLParser is not None:
+        # lexbor gives the concatenated row text directly; no per-<td>
+        # Python wrappers are ever constructed.
+        for tr in LexborHTMLParser(html).css("table tr"):
+            if must_contain is not None and must_contain not in tr.html:
+                continue
+            yield _textnorm(tr.text(separator=" "))
+        return
+
+    # Fallback: iterate <tr> elements straight off the lxml tree and free
+    # each one after its text is read — no BS4 wrapper objects, and memory
+    # stays O(row) instead of O(document). The already-decoded str goes to
+    # lxml as-is: re-encoding would make libxml2 guess the charset again
+    # (latin-1 unless the page declares one), mojibaking the unit glyphs.
+    root = etree.fromstring(html, etree.HTMLParser())
+    if root is None:
+        return
+    for tr in root.iter("tr"):
+        text = _ROW_TEXT(tr)
+        tr.clear()
+        if must_contain is not None and must_contain not in text:
+            continue
+        yield _textnorm(text)
 
 def parse_species_thermo(html: str) -> tuple[float | None, float | None]:
     """Return (ΔfH°_298_K_kJ_per_mol, S°_298_K_kJ_per_mol_K) if found; else (None, None)."""
-    soup = BeautifulSoup(html, "html.parser")
-
-    def textnorm(s: str) -> str:
-        return " ".join(s.split()).replace("\xa0", " ")
-
     delta_hf = None  # kJ/mol
     s_molar = None   # kJ/(mol·K)  NOTE: NIST S° is often J/(mol·K), convert /1000
 
-    # Search all tables for rows that mention Standard enthalpy of formation or Standard molar entropy
-    for table in soup.find_all("table"):
-        for tr in table.find_all("tr"):
-            tds = tr.find_all(["td", "th"])
-            if not tds:
-                continue
-            row_text = textnorm(" ".join(td.get_text(" ", strip=True) for td in tds))
-            # Heuristics for entries at 298 K
-            if ("Standard enthalpy of formation" in row_text or "ΔfH°" in row_text) and "298" in row_text:
-                # Find a number in kJ/mol
-                m = re.search(r"([-+]?\d+(?:\.\d+)?)\s*kJ/mol", row_text)
-                if m:
-                    delta_hf = float(m.group(1))
-            if ("Standard molar entropy" in row_text or "S°" in row_text) and "298" in row_text:
-                # Could be J/mol·K or kJ/mol·K
-                m_kj = re.search(r"([-+]?\d+(?:\.\d+)?)\s*kJ/(?:mol·K|mol K|molK)", row_text)
-                m_j  = re.search(r"([-+]?\d+(?:\.\d+)?)\s*J/(?:mol·K|mol K|molK)", row_text)
-                if m_kj:
-                    s_molar = float(m_kj.group(1))
-                elif m_j:
-                    s_molar = float(m_j.group(1)) / 1000.0
+    # Fast path: one tag-strip pass, then a windowed search per property.
+    # str.find on the literal label is far cheaper than running the full
+    # regex over the page: an absent label skips its regex entirely, and a
+    # present one anchors the search to a small window after it.
+    # unescape() first: NIST pages entity-encode the unit separators
+    # (&middot;, &deg;), which would never match the literal ·/° in the
+    # unit regexes.
+    text = _textnorm(unescape(TAG_RE.sub(" ", html)))
+    # Mirror the fallback's 298 K guard: only accept a value whose row
+    # mentions 298 between the label and the number, so a property quoted
+    # at some other temperature is not taken as the standard-state one.
+    i = text.find("Standard enthalpy of formation")
+    if i != -1:
+        m = HF_RE.search(text, i, i + 2000)
+        if m and "298" in text[i:m.start(1)]:
+            delta_hf = float(m.group(1))
+    i = text.find("Standard molar entropy")
+    if i != -1:
+        m = S_RE.search(text, i, i + 2000)
+        if m and "298" in text[i:m.start(1)]:
+            s_molar = float(m.group(1)) if m.group(2) else float(m.group(1)) / 1000.0
+    if delta_hf is not None and s_molar is not None:
+        return delta_hf, s_molar
+
+    # Fallback (template change, regexes missed): walk the parsed rows that
+    # mention Standard enthalpy of formation or Standard molar entropy,
+    # filling only the properties the fast path left unresolved. Both
+    # branches below require a 298 K row, so the generator filters on
+    # "298" before assembling any row text.
+    for row_text in _iter_row_texts(html, must_contain="298"):
+        # Heuristics for entries at 298 K
+        if delta_hf is None and \
+                ("Standard enthalpy of formation" in row_text or "ΔfH°" in row_text) and "298" in row_text:
+            # Find a number in kJ/mol
+            m = re.search(r"([-+]?\d+(?:\.\d+)?)\s*kJ/mol", row_text)
+            if m:
+                delta_hf = float(m.group(1))
+        if s_molar is None and \
+                ("Standard molar entropy" in row_text or "S°" in row_text) and "298" in row_text:
+            # Could be J/mol·K or kJ/mol·K
+            m_kj = re.search(r"([-+]?\d+(?:\.\d+)?)\s*kJ/(?:mol·K|mol K|molK)", row_text)
+            m_j  = re.search(r"([-+]?\d+(?:\.\d+)?)\s*J/(?:mol·K|mol K|molK)", row_text)
+            if m_kj:
+                s_molar = float(m_kj.group(1))
+            elif m_j:
+                s_molar = float(m_j.group(1)) / 1000.0
 
     return delta_hf, s_molar
 
@@ -163,6 +337,8 @@ def parse_species_thermo(html: str) -> tuple[float | None, float | None]:
 def load_cache(path: Path) -> Dict[str, dict]:
     if path.exists():
         try:
+            if orjson is not None:
+                return orjson.loads(path.read_bytes())
             return json.loads(path.read_text())
         except Exception:
             return {}
@@ -170,14 +346,25 @@ def load_cache(path: Path) -> Dict[str, dict]:
 
 def save_cache(path: Path, cache: Dict[str, dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(cache, indent=2))
+    if orjson is not None:
+        path.write_bytes(
+            orjson.dumps(cache, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        )
+    else:
+        path.write_text(json.dumps(cache, indent=2))
 
-def get_species_thermo(formula: str, cache: dict) -> tuple[float | None, float | None]:
-    """Return (ΔfH°_kJ/mol, S°_kJ/mol/K). Cache results."""
+def lookup_species(formula: str, cache: dict) -> tuple[float | None, float | None]:
+    """Read-only cache lookup: (ΔfH°_kJ/mol, S°_kJ/mol/K), never the network."""
+    rec = cache.get(formula.strip())
+    if rec is None:
+        return None, None
+    return rec.get("delta_hf_kj_per_mol"), rec.get("s_kj_per_mol_k")
+
+def fetch_species_into_cache(formula: str, cache: dict) -> None:
+    """Resolve one formula into the cache; no-op when already present."""
     key = formula.strip()
     if key in cache:
-        rec = cache[key]
-        return rec.get("delta_hf_kj_per_mol"), rec.get("s_kj_per_mol_k")
+        return
 
     # Fetch formula page, then first species detail, then parse
     try:
@@ -186,15 +373,24 @@ def get_species_thermo(formula: str, cache: dict) -> tuple[float | None, float |
         if not detail_url:
             print(f"[warn] No species detail URL for {formula}")
             cache[key] = {"delta_hf_kj_per_mol": None, "s_kj_per_mol_k": None}
-            return None, None
+            return
         detail_html = fetch_species_detail(detail_url)
         dhf, s = parse_species_thermo(detail_html)
+    except OfflineMiss:
+        # An offline cache miss says nothing about the species itself —
+        # writing a None record here would block later online runs from
+        # ever fetching it. Let the caller decide how to fail.
+        raise
     except Exception as e:
         print(f"[warn] Fetch/parse failed for {formula}: {e}")
         dhf, s = None, None
 
     cache[key] = {"delta_hf_kj_per_mol": dhf, "s_kj_per_mol_k": s}
-    return dhf, s
+
+def get_species_thermo(formula: str, cache: dict) -> tuple[float | None, float | None]:
+    """Return (ΔfH°_kJ/mol, S°_kJ/mol/K), fetching on a cache miss."""
+    fetch_species_into_cache(formula, cache)
+    return lookup_species(formula, cache)
 
 # ----------------------------
 # Reaction thermodynamics
@@ -235,6 +431,59 @@ def reaction_thermo(reaction: str, cache: dict, T: float = T_REF) -> tuple[float
     dG = dH - T * dS                                  # kJ/mol
     return dH, dS, dG
 
+def reaction_thermo_batch(reactions: List[str], cache: dict, T: float = T_REF):
+    """Compute (ΔH°, ΔS°, ΔG°) arrays for all reactions at once.
+
+    Once the cache is populated, the remaining arithmetic is a
+    matrix-vector product: the signed stoichiometry matrix ν[reaction,
+    species] against the ΔfH°/S° property vectors. Reactions with a
+    malformed equation or missing species data come back as NaN rows."""
+    parsed = []
+    all_species: set = set()
+    for rxn in reactions:
+        try:
+            lhs, rhs = parse_reaction(rxn)
+        except ValueError as e:
+            print(f"[warn] {e}")
+            parsed.append(None)
+            continue
+        parsed.append((lhs, rhs))
+        all_species |= lhs.keys() | rhs.keys()
+
+    species = sorted(all_species)
+    idx = {sp: i for i, sp in enumerate(species)}
+    H = np.full(len(species), np.nan)
+    S = np.full(len(species), np.nan)
+    for sp, i in idx.items():
+        # Read-only: main() has already prefetched everything it could.
+        dhf, s0 = lookup_species(sp, cache)
+        if dhf is not None:
+            H[i] = dhf               # kJ/mol
+        if s0 is not None:
+            S[i] = s0                # kJ/(mol·K)
+
+    nu = np.zeros((len(reactions), len(species)))
+    for r, pair in enumerate(parsed):
+        if pair is None:
+            continue
+        lhs, rhs = pair
+        for sp, coef in rhs.items():
+            nu[r, idx[sp]] += coef
+        for sp, coef in lhs.items():
+            nu[r, idx[sp]] -= coef
+
+    # Zero out missing properties for the matmul, then NaN any reaction that
+    # actually touches a species without data (or failed to parse).
+    missing = np.isnan(H) | np.isnan(S)
+    dH = nu @ np.where(missing, 0.0, H)
+    dS = nu @ np.where(missing, 0.0, S)
+    bad = (np.abs(nu[:, missing]).sum(axis=1) > 0) if missing.any() else np.zeros(len(reactions), dtype=bool)
+    bad |= np.array([pair is None for pair in parsed])
+    dH[bad] = np.nan
+    dS[bad] = np.nan
+    dG = dH - T * dS
+    return dH, dS, dG
+
 # ----------------------------
 # CLI
 # ----------------------------
@@ -262,14 +511,21 @@ def main() -> None:
     ap.add_argument("--reactions-file", type=str, default="", help="Text file with one reaction per line.")
     ap.add_argument("--temperature", type=float, default=T_REF, help="Temperature in K (default 298.15).")
     ap.add_argument("--sleep", type=float, default=0.8, help="Seconds to sleep between fetches to be polite.")
+    ap.add_argument("--offline", action="store_true",
+                    help="Never hit the network; raise on an HTML-cache miss (useful for CI).")
     args = ap.parse_args()
 
+    global HTML_CACHE_DIR, OFFLINE, MIN_REQUEST_INTERVAL
+    OFFLINE = args.offline
+    MIN_REQUEST_INTERVAL = max(0.0, args.sleep)
+
     root = Path.cwd()
     data_raw = root / "data" / "raw"
     data_proc = root / "data" / "processed"
     models_dir = root / "models"
     scripts_dir = root / "scripts"
     cache_path = data_raw / "nist_species_cache.json"
+    HTML_CACHE_DIR = data_raw / "html"
 
     data_raw.mkdir(parents=True, exist_ok=True)
     data_proc.mkdir(parents=True, exist_ok=True)
@@ -286,29 +542,49 @@ def main() -> None:
     # Load cache
     cache = load_cache(cache_path)
 
-    rows = []
-    for rxn in reactions:
-        print(f"[info] Processing: {rxn}")
-        dH, dS, dG = reaction_thermo(rxn, cache, T=args.temperature)
-        if dH is None or dS is None or dG is None:
-            print(f"[warn] Skipping {rxn}: incomplete species data.")
-        else:
-            rows.append({
-                "reaction": rxn,
-                "delta_h": dH,
-                "delta_s": dS,
-                "delta_g": dG,
-                "T_K": args.temperature,
-            })
-        # Save cache incrementally
-        save_cache(cache_path, cache)
-        time.sleep(max(0.0, args.sleep))
-
-    if not rows:
+    # Resolve every uncached species up front, in parallel: fetches are
+    # latency-bound, so overlapping them hides most of the round trips. The
+    # politeness sleep moves into the workers, paid only on real fetches.
+    needed = {sp for sp in collect_species(reactions) if sp.strip() not in cache}
+
+    if needed:
+        def _prefetch(formula: str) -> None:
+            fetch_species_into_cache(formula, cache)
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(_prefetch, sorted(needed)))
+        except OfflineMiss as e:
+            # Hermetic runs fail loudly: the cache save below still keeps
+            # any species that did resolve from disk.
+            print(f"[error] {e}")
+            raise SystemExit(1)
+        finally:
+            # One write for the whole run; the finally keeps partial
+            # progress on Ctrl-C instead of rewriting the file per species.
+            save_cache(cache_path, cache)
+
+    # With the cache populated, the remaining work is three array operations.
+    dH, dS, dG = reaction_thermo_batch(reactions, cache, T=args.temperature)
+
+    reaction_arr = np.asarray(reactions, dtype=object)
+    valid = ~(np.isnan(dH) | np.isnan(dS))
+    for rxn in reaction_arr[~valid]:
+        print(f"[warn] Skipping {rxn}: incomplete species data.")
+
+    if not valid.any():
         print("[error] No complete rows computed. Try different reactions or inspect cache.")
         return
 
-    df = pd.DataFrame(rows)
+    # Column-wise construction: each column arrives as a typed array, so
+    # pandas skips the row-by-row dict path and its dtype inference.
+    df = pd.DataFrame({
+        "reaction": reaction_arr[valid],
+        "delta_h": dH[valid],
+        "delta_s": dS[valid],
+        "delta_g": dG[valid],
+        "T_K": np.full(int(valid.sum()), args.temperature),
+    })
     # Primary outputs
     delta_g_csv = data_proc / "delta_g.csv"
     df[["reaction", "delta_g"]].to_csv(delta_g_csv, index=False)